@@ -44,7 +44,7 @@ def count_steps(jsonl_path: Path) -> int:
         return count
 
     try:
-        with open(jsonl_path, "r") as f:
+        with open(jsonl_path, "r", encoding="utf-8") as f:
             for line in f:
                 if not line.strip():
                     continue
@@ -126,10 +126,8 @@ def main():
 
         # Create final commit with session data in ledgit
         ledgit = state_manager.ledgit
-        ledgit._run_git(["add", "."], cwd=ledgit.project_dir)
-        ledgit._run_git(
-            ["commit", "-m", f"[ledgit] Session {session_id[:8]} ended: {reason}"],
-            cwd=ledgit.project_dir
+        ledgit.commit_project_data(
+            f"[ledgit] Session {session_id[:8]} ended: {reason}"
         )
 
         print(f"Ledgit session complete: {ledgit.project_dir}", file=sys.stderr)
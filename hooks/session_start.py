@@ -46,7 +46,8 @@ def main():
         project_path=cwd
     )
 
-    # Ensure ledgit project is initialized (creates git repo, syncs files)
+    # Ensure ledgit project is initialized (creates git repo; files are
+    # staged by the first snapshot)
     state_manager.ensure_project_initialized()
 
     # Initialize session (creates folder, metadata, index entry)
@@ -21,26 +21,40 @@ from state_manager import StateManager, get_trajectories_dir
 from transcript_parser import TranscriptParser
 
 
-def get_final_agent_response(transcript_path: str, last_position: int) -> tuple[str, str, int]:
+def get_final_agent_response(
+    transcript_path: str,
+    last_position: int,
+    byte_offset: int = 0,
+    offset_messages: int = 0
+) -> tuple[str, str, int, int, int]:
     """
     Get the final agent response from the transcript.
 
+    Only the bytes after byte_offset are read, so repeated Stop events
+    don't re-parse the whole transcript.
+
     Args:
         transcript_path: Path to transcript file
         last_position: Last processed line number
+        byte_offset: Byte offset the transcript was previously read up to
+        offset_messages: Number of messages before byte_offset
 
     Returns:
-        Tuple of (text_message, thinking_content, new_position)
+        Tuple of (text_message, thinking_content, new_position,
+        new_byte_offset, new_offset_messages)
     """
     try:
         parser = TranscriptParser(transcript_path)
-        messages = parser.parse()
+        messages, new_byte_offset = parser.parse_from(byte_offset)
+        if new_byte_offset < byte_offset:
+            # Transcript was truncated and re-read from the start
+            offset_messages = 0
 
         text_parts = []
         thinking_parts = []
         new_position = last_position
 
-        for i, message in enumerate(messages):
+        for i, message in enumerate(messages, start=offset_messages):
             if i < last_position:
                 continue
 
@@ -56,9 +70,10 @@ def get_final_agent_response(transcript_path: str, last_position: int) -> tuple[
         text = "\n".join(text_parts) if text_parts else ""
         thinking = "\n".join(thinking_parts) if thinking_parts else ""
 
-        return text, thinking, new_position
+        return (text, thinking, new_position,
+                new_byte_offset, offset_messages + len(messages))
     except Exception:
-        return "", "", last_position
+        return "", "", last_position, byte_offset, offset_messages
 
 
 def main():
@@ -88,10 +103,12 @@ def main():
 
     # Get final response from transcript
     last_position = state_manager.get_transcript_position()
-    text_message, thinking_content, new_position = get_final_agent_response(
-        transcript_path, last_position
+    byte_offset, offset_messages = state_manager.get_transcript_offset()
+    (text_message, thinking_content, new_position,
+     byte_offset, offset_messages) = get_final_agent_response(
+        transcript_path, last_position, byte_offset, offset_messages
     )
-    state_manager.update_transcript_position(new_position)
+    state_manager.update_transcript_progress(new_position, byte_offset, offset_messages)
 
     # Get next step ID for this response
     step_id = state_manager.get_next_step_id()
@@ -134,7 +151,7 @@ def main():
         writer.write_agent_step(
             step_id=step_id,
             message=text_message,
-            reasoning_content=thinking_content if thinking_content else None,
+            reasoning_content=thinking_content,
             model_name=state.model_name,
             extra=extra
         )
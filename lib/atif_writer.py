@@ -5,11 +5,38 @@ Based on the Agent Trajectory Interchange Format (ATIF) v1.4 specification.
 https://harbor.dev/docs/atif
 """
 
+import atexit
 import json
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, BinaryIO
+
+# orjson is optional - it serializes much faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize obj as a single JSONL line."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return (json.dumps(obj) + "\n").encode("utf-8")
+
+
+def _dumps_pretty(obj: Any) -> bytes:
+    """Serialize obj as indented JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2).encode("utf-8")
 
 
 @dataclass
@@ -244,6 +271,23 @@ class ATIFWriter:
         # Initialize header written flag
         self._header_written = False
 
+        # JSONL handle, opened on first write so jsonl_path can be repointed
+        self._fh: Optional[BinaryIO] = None
+
+    def _jsonl_file(self) -> BinaryIO:
+        """Get the append handle for the JSONL file, opening it if needed."""
+        if self._fh is None:
+            self._fh = open(self.jsonl_path, "ab")
+            atexit.register(self._fh.close)
+        return self._fh
+
+    def close(self) -> None:
+        """Close the JSONL file handle."""
+        if self._fh is not None:
+            atexit.unregister(self._fh.close)
+            self._fh.close()
+            self._fh = None
+
     def _get_timestamp(self) -> str:
         """Get current timestamp in ISO 8601 format."""
         return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -261,9 +305,11 @@ class ATIFWriter:
             "started_at": self._get_timestamp(),
         }
 
-        with open(self.jsonl_path, "w") as f:
-            f.write(json.dumps(header) + "\n")
-            f.flush()
+        # The header starts a new trajectory file
+        f = self._jsonl_file()
+        f.truncate(0)
+        f.write(_dumps_line(header))
+        f.flush()
 
         self._header_written = True
 
@@ -280,9 +326,9 @@ class ATIFWriter:
         step_dict = step.to_dict()
         step_dict["_type"] = "step"
 
-        with open(self.jsonl_path, "a") as f:
-            f.write(json.dumps(step_dict) + "\n")
-            f.flush()
+        f = self._jsonl_file()
+        f.write(_dumps_line(step_dict))
+        f.flush()
 
     def write_user_step(self, step_id: int, message: str,
                         extra: Optional[dict] = None) -> Step:
@@ -324,7 +370,7 @@ class ATIFWriter:
         Args:
             step_id: Sequential step ID
             message: Agent's text response
-            reasoning_content: Agent's thinking/reasoning
+            reasoning_content: Agent's thinking/reasoning (omitted if empty)
             tool_calls: List of tool calls made
             observation: Observation with tool results
             metrics: Token/cost metrics
@@ -340,7 +386,7 @@ class ATIFWriter:
             source="agent",
             message=message,
             model_name=model_name or self.agent.model_name,
-            reasoning_content=reasoning_content,
+            reasoning_content=reasoning_content or None,
             tool_calls=tool_calls,
             observation=observation,
             metrics=metrics,
@@ -382,12 +428,15 @@ class ATIFWriter:
         Returns:
             The complete Trajectory object
         """
+        # Make sure everything written through this writer is on disk
+        self.close()
+
         # Read JSONL and reconstruct trajectory
         steps = []
         header_data = None
 
         if self.jsonl_path.exists():
-            with open(self.jsonl_path, "r") as f:
+            with open(self.jsonl_path, "r", encoding="utf-8") as f:
                 for line in f:
                     if not line.strip():
                         continue
@@ -408,8 +457,8 @@ class ATIFWriter:
         )
 
         # Write final JSON
-        with open(self.json_path, "w") as f:
-            json.dump(trajectory.to_dict(), f, indent=2)
+        with open(self.json_path, "wb") as f:
+            f.write(_dumps_pretty(trajectory.to_dict()))
 
         return trajectory
 
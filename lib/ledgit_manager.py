@@ -3,39 +3,79 @@ Ledgit Manager - Project-level file versioning with git.
 
 Manages:
 - Project identification and directory structure
-- File syncing from source project (respecting .gitignore)
+- File snapshots from source project (respecting .gitignore)
 - Git operations (init, add, commit)
 - Commit tracking (step_id -> commit SHA mapping)
 
 Directory structure:
 ~/.claude/ledgit/projects/{project-hash}/
 ├── .git/                           # Git repo for files + trajectories
-├── files/                          # Mirrored project files
+├── files/                          # Project files (in git history only)
 ├── trajectories/                   # Session trajectories
 │   └── {session-folder}/
 │       ├── trajectory.json
 │       ├── trajectory.jsonl
 │       ├── metadata.json
 │       ├── state.json
-│       └── commits.json            # step_id -> commit SHA mapping
+│       └── commits.jsonl           # step_id -> commit SHA mapping
+├── .ledgit_cache/                  # Snapshot caches (not committed)
 ├── ledgit.json                     # Project config
 └── index.json                      # Sessions index for this project
 """
 
+import fnmatch
+import functools
 import hashlib
 import json
 import os
+import pickle
 import shutil
+import stat
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, List, Any
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple, Union
+
+# pathspec is optional - fall back to simple fnmatch-based matching without it
+try:
+    import pathspec
+except ImportError:
+    pathspec = None
+
+# pygit2 is optional - snapshots are created in-process when available,
+# otherwise through git subprocesses
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# xxhash is optional - fall back to blake2b for content fingerprints
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 
 # Default ledgit directory
 DEFAULT_LEDGIT_DIR = Path.home() / ".claude" / "ledgit"
 
+# Directory in the ledgit repo tree that holds the source project's files
+FILES_PREFIX = "files"
+
+# Directory in the ledgit project for per-project caches (never committed)
+CACHE_DIR_NAME = ".ledgit_cache"
+
+# Object name used by update-index to remove an entry
+NULL_SHA = "0" * 40
+
+# Files up to this size are fingerprinted by content rather than mtime
+FINGERPRINT_MAX_BYTES = 1024 * 1024
+
+# Minimum number of files per concurrent `git hash-object` process
+HASH_CHUNK_MIN_FILES = 500
+
 
 @dataclass
 class ProjectConfig:
@@ -108,14 +148,32 @@ def get_ledgit_dir() -> Path:
     return DEFAULT_LEDGIT_DIR
 
 
+# Resolved source paths, so repeated managers in one process skip resolve()
+_resolved_paths: Dict[str, Path] = {}
+
+# Gitignore parsers by source path, shared by managers in one process
+_ignore_parsers: Dict[Path, "GitIgnoreParser"] = {}
+
+
+def resolve_source_path(project_path: str) -> Path:
+    """Resolve a project path, caching the result for this process."""
+    resolved = _resolved_paths.get(project_path)
+    if resolved is None:
+        resolved = Path(project_path).resolve()
+        _resolved_paths[project_path] = resolved
+    return resolved
+
+
+@functools.lru_cache(maxsize=64)
 def compute_project_hash(project_path: str) -> str:
     """Compute a stable hash for a project path."""
     # Normalize the path
-    canonical_path = str(Path(project_path).resolve())
+    canonical_path = str(resolve_source_path(project_path))
     # Create hash (first 12 chars of SHA256)
     return hashlib.sha256(canonical_path.encode()).hexdigest()[:12]
 
 
+@functools.lru_cache(maxsize=64)
 def get_project_name(project_path: str) -> str:
     """Extract project name from path."""
     return Path(project_path).name or "unknown"
@@ -129,21 +187,83 @@ class GitIgnoreParser:
     - Root .gitignore
     - Nested .gitignore files
     - Always ignores .git/ directories
+
+    When `pathspec` is installed, all patterns are compiled once into a
+    single PathSpec using git's wildmatch semantics. Otherwise a simple
+    fnmatch-based matcher is used.
     """
 
     def __init__(self, source_path: Path):
+        """
+        Load gitignore patterns for a source project.
+
+        Args:
+            source_path: Root of the source project
+        """
         self.source_path = source_path
         self.patterns: List[str] = []
-        self._load_patterns()
+        # Patterns rewritten relative to source_path for pathspec
+        self._spec_lines: List[str] = []
+        self.spec = None
+
+        gitignore_files = self._find_gitignore_files()
+        self.cache_key = _gitignore_key(self.source_path, gitignore_files)
+        self._load_patterns(gitignore_files)
+        self._compile()
+
+    def _find_gitignore_files(self) -> List[Path]:
+        """
+        Find .gitignore files in the source project, parents first.
+
+        Directories ignored by the root .gitignore are not searched, since
+        git does not read .gitignore files inside them either.
+        """
+        gitignore_files = []
+        root_gitignore = self.source_path / ".gitignore"
+        if root_gitignore.is_file():
+            gitignore_files.append(root_gitignore)
+
+        # Match directories against the root patterns while searching
+        self._load_patterns(gitignore_files)
+        self._compile()
+        for path, rel_path, _ in walk_files(str(self.source_path), self.should_ignore_dir):
+            if rel_path.endswith("/.gitignore"):
+                gitignore_files.append(Path(path))
+
+        self.patterns = []
+        self._spec_lines = []
+        self.spec = None
+        return gitignore_files
+
+    def _compile(self) -> None:
+        """Compile the loaded patterns into a PathSpec, if available."""
+        if pathspec is not None:
+            self.spec = pathspec.GitIgnoreSpec.from_lines(self._spec_lines)
+
+    def is_fresh(self) -> bool:
+        """
+        Check that none of the loaded .gitignore files changed since loading.
 
-    def _load_patterns(self) -> None:
+        Only the files seen at load time are checked; a newly added nested
+        .gitignore is picked up the next time a parser is built.
+        """
+        for rel_path, mtime_ns in self.cache_key:
+            try:
+                if (self.source_path / rel_path).stat().st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _load_patterns(self, gitignore_files: List[Path]) -> None:
         """Load all gitignore patterns from the source project."""
         # Always ignore .git directories
-        self.patterns.append(".git/")
-        self.patterns.append(".git")
+        for pattern in (".git/", ".git"):
+            self.patterns.append(pattern)
+            self._spec_lines.append(pattern)
 
-        # Find and parse all .gitignore files
-        for gitignore_path in self.source_path.rglob(".gitignore"):
+        # Parse all .gitignore files
+        for gitignore_path in gitignore_files:
             self._parse_gitignore(gitignore_path)
 
     def _parse_gitignore(self, gitignore_path: Path) -> None:
@@ -159,18 +279,31 @@ class GitIgnoreParser:
                     # Store pattern with relative directory context
                     if rel_dir == Path("."):
                         self.patterns.append(line)
+                        self._spec_lines.append(line)
                     else:
                         # Patterns in subdirectories apply to that subdirectory
                         self.patterns.append(f"{rel_dir}/{line}")
+                        self._spec_lines.append(_scope_pattern(line, rel_dir))
         except (IOError, OSError):
             pass
 
-    def should_ignore(self, rel_path: Path) -> bool:
+    def should_ignore(self, rel_path: Union[str, Path]) -> bool:
+        """Check if a relative path should be ignored."""
+        if self.spec is not None:
+            return self.spec.match_file(str(rel_path))
+        return self._match_patterns(Path(rel_path))
+
+    def should_ignore_dir(self, rel_dir: str) -> bool:
+        """Check if a relative directory, and everything in it, should be ignored."""
+        if self.spec is not None:
+            return self.spec.match_file(f"{rel_dir}/")
+        return self._match_patterns(Path(rel_dir))
+
+    def _match_patterns(self, rel_path: Path) -> bool:
         """
-        Check if a relative path should be ignored.
+        Check a relative path against the stored patterns.
 
-        Uses simple pattern matching. For production, consider using
-        the `pathspec` or `gitignore-parser` library.
+        Simple pattern matching used when `pathspec` is not installed.
         """
         path_str = str(rel_path)
         path_parts = rel_path.parts
@@ -186,7 +319,6 @@ class GitIgnoreParser:
                 return True
             # Handle wildcard patterns (simple implementation)
             elif "*" in pattern:
-                import fnmatch
                 if fnmatch.fnmatch(path_str, pattern):
                     return True
                 # Also check against just the filename
@@ -202,6 +334,138 @@ class GitIgnoreParser:
         return False
 
 
+def _gitignore_key(source_path: Path, gitignore_files: List[Path]) -> Tuple[Tuple[str, int], ...]:
+    """Build a cache key from the paths and mtimes of .gitignore files."""
+    key = []
+    for gitignore_path in gitignore_files:
+        try:
+            mtime_ns = gitignore_path.stat().st_mtime_ns
+        except OSError:
+            continue
+        key.append((str(gitignore_path.relative_to(source_path)), mtime_ns))
+    return tuple(sorted(key))
+
+
+def walk_files(
+    root: str,
+    prune: Optional[Callable[[str], bool]] = None
+) -> Iterator[Tuple[str, str, os.DirEntry]]:
+    """
+    Walk a directory tree with os.scandir.
+
+    Symlinked directories are not followed, matching Path.rglob.
+
+    Args:
+        root: Directory to walk
+        prune: Called with each directory's POSIX path relative to root;
+            returning True skips the directory and everything below it
+
+    Yields:
+        (path, rel_path, entry) for each file, with rel_path in POSIX form
+    """
+    stack = [("", root)]
+    while stack:
+        rel_dir, dir_path = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        for entry in entries:
+            rel_path = f"{rel_dir}{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if prune is None or not prune(rel_path):
+                        stack.append((f"{rel_path}/", entry.path))
+                elif entry.is_file():
+                    yield entry.path, rel_path, entry
+            except OSError:
+                continue
+
+
+def _file_fingerprint(path: str, file_stat: os.stat_result) -> Optional[tuple]:
+    """
+    Fingerprint a source file to tell whether it changed since last hashed.
+
+    Small files are fingerprinted by content, which catches edits that
+    keep size and mtime; larger ones fall back to size and mtime.
+
+    Returns:
+        Fingerprint tuple, or None if the file could not be read
+    """
+    if file_stat.st_size > FINGERPRINT_MAX_BYTES:
+        return (file_stat.st_size, "mtime", file_stat.st_mtime_ns)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if xxhash is not None:
+        return (len(data), "xxh3", xxhash.xxh3_64_intdigest(data))
+    return (len(data), "blake2b", hashlib.blake2b(data, digest_size=8).digest())
+
+
+def _stat_unchanged(path: str, file_stat: os.stat_result) -> bool:
+    """Check that a file's size, mtime and ctime still match file_stat."""
+    try:
+        current = os.stat(path)
+    except OSError:
+        return False
+    return (
+        current.st_size == file_stat.st_size
+        and current.st_mtime_ns == file_stat.st_mtime_ns
+        and current.st_ctime_ns == file_stat.st_ctime_ns
+    )
+
+
+def _parse_commit_sha(commit_output: str) -> Optional[str]:
+    """
+    Extract the commit SHA from `git commit` output.
+
+    The first line looks like "[main 1a2b3c4] message" or
+    "[main (root-commit) 1a2b3c4] message".
+    """
+    first_line = commit_output.lstrip().split("\n", 1)[0]
+    if not first_line.startswith("[") or "]" not in first_line:
+        return None
+    return first_line[1:first_line.index("]")].split()[-1]
+
+
+def _quote_stdin_path(rel_path: str) -> str:
+    """
+    Quote a path for `git hash-object --stdin-paths` if needed.
+
+    Git C-unquotes lines starting with a double quote, so such paths and
+    paths containing a newline are written in C-quoted form.
+    """
+    if not rel_path.startswith('"') and "\n" not in rel_path:
+        return rel_path
+    escaped = (
+        rel_path.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+    return f'"{escaped}"'
+
+
+def _scope_pattern(line: str, rel_dir: Path) -> str:
+    """
+    Rewrite a pattern from a nested .gitignore relative to the source root.
+
+    Patterns containing a slash are anchored to the .gitignore's directory;
+    patterns without one match at any depth below it.
+    """
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    if "/" in line.rstrip("/"):
+        scoped = f"{rel_dir.as_posix()}/{line.lstrip('/')}"
+    else:
+        scoped = f"{rel_dir.as_posix()}/**/{line}"
+    return f"!{scoped}" if negate else scoped
+
+
 class LedgitManager:
     """
     Manager for ledgit project-level operations.
@@ -220,17 +484,24 @@ class LedgitManager:
         Args:
             source_path: Path to the source project being tracked
         """
-        self.source_path = Path(source_path).resolve()
+        self.source_path = resolve_source_path(source_path)
         self.project_hash = compute_project_hash(str(self.source_path))
         self.project_name = get_project_name(str(self.source_path))
 
         self.ledgit_dir = get_ledgit_dir()
         self.project_dir = self.ledgit_dir / "projects" / self.project_hash
-        self.files_dir = self.project_dir / "files"
         self.trajectories_dir = self.project_dir / "trajectories"
 
         self._config: Optional[ProjectConfig] = None
         self._ignore_parser: Optional[GitIgnoreParser] = None
+        self._repo = None
+
+        # Never take optional locks or prompt for credentials from hooks
+        self._git_env = {
+            **os.environ,
+            "GIT_OPTIONAL_LOCKS": "0",
+            "GIT_TERMINAL_PROMPT": "0",
+        }
 
     @property
     def config_file(self) -> Path:
@@ -244,10 +515,33 @@ class LedgitManager:
     def global_index_file(self) -> Path:
         return self.ledgit_dir / "index.json"
 
+    @property
+    def repo(self):
+        """
+        In-process handle on the ledgit repo.
+
+        Returns:
+            pygit2.Repository, or None if pygit2 is not installed or the
+            repo does not exist yet
+        """
+        if self._repo is None and pygit2 is not None:
+            if (self.project_dir / ".git").exists():
+                self._repo = pygit2.Repository(str(self.project_dir))
+        return self._repo
+
+    @property
+    def cache_dir(self) -> Path:
+        return self.project_dir / CACHE_DIR_NAME
+
     @property
     def ignore_parser(self) -> GitIgnoreParser:
         if self._ignore_parser is None:
-            self._ignore_parser = GitIgnoreParser(self.source_path)
+            # Reuse a parser built by another manager in this process
+            parser = _ignore_parsers.get(self.source_path)
+            if parser is None or not parser.is_fresh():
+                parser = GitIgnoreParser(self.source_path)
+                _ignore_parsers[self.source_path] = parser
+            self._ignore_parser = parser
         return self._ignore_parser
 
     def project_exists(self) -> bool:
@@ -258,21 +552,35 @@ class LedgitManager:
         """
         Initialize a new ledgit project.
 
-        Creates directory structure and initializes git repo.
+        Creates directory structure and initializes git repo. Returns the
+        existing config without doing any work if the project is already
+        initialized. Source files are not synced here; the first snapshot
+        stages them, keeping SessionStart fast.
         """
+        if self.project_exists():
+            config = self.load_config()
+            if config is not None:
+                return config
+
         # Create directories
         self.project_dir.mkdir(parents=True, exist_ok=True)
-        self.files_dir.mkdir(exist_ok=True)
         self.trajectories_dir.mkdir(exist_ok=True)
 
         # Initialize git repo if not exists
         git_dir = self.project_dir / ".git"
-        if not git_dir.exists():
+        created = not git_dir.exists()
+        if created:
             self._run_git(["init"], cwd=self.project_dir)
+            self._run_git(
+                ["config", "core.untrackedCache", "true"],
+                cwd=self.project_dir
+            )
+            self._run_git(["config", "gc.auto", "0"], cwd=self.project_dir)
 
             # Create initial .gitignore for the ledgit repo
-            gitignore_content = """# Ledgit repo gitignore
-# Nothing to ignore - we want to track everything
+            gitignore_content = f"""# Ledgit repo gitignore
+# Track everything except local caches
+{CACHE_DIR_NAME}/
 """
             (self.project_dir / ".gitignore").write_text(gitignore_content)
 
@@ -290,16 +598,19 @@ class LedgitManager:
         # Update global index
         self._update_global_index()
 
-        # Initial file sync and commit
-        self.sync_files()
-        self._run_git(["add", "."], cwd=self.project_dir)
+        if created:
+            self._first_time_setup()
+
+        return config
+
+    def _first_time_setup(self) -> None:
+        """Create the initial commit in a newly created ledgit repo."""
+        self._stage_project_data()
         self._run_git(
             ["commit", "-m", "Initial ledgit snapshot", "--allow-empty"],
             cwd=self.project_dir
         )
 
-        return config
-
     def load_config(self) -> Optional[ProjectConfig]:
         """Load project configuration."""
         if self._config is not None:
@@ -318,7 +629,7 @@ class LedgitManager:
     def _save_config(self, config: ProjectConfig) -> None:
         """Save project configuration."""
         with open(self.config_file, "w") as f:
-            json.dump(config.to_dict(), f, indent=2)
+            f.write(json.dumps(config.to_dict(), indent=2))
 
     def _update_global_index(self) -> None:
         """Update the global projects index."""
@@ -326,10 +637,11 @@ class LedgitManager:
 
         # Load existing index
         index = {"projects": []}
+        existing_content = None
         if self.global_index_file.exists():
             try:
-                with open(self.global_index_file) as f:
-                    index = json.load(f)
+                existing_content = self.global_index_file.read_text()
+                index = json.loads(existing_content)
             except json.JSONDecodeError:
                 pass
 
@@ -349,82 +661,441 @@ class LedgitManager:
                 "ledgit_path": str(self.project_dir),
             })
 
-        with open(self.global_index_file, "w") as f:
-            json.dump(index, f, indent=2)
+        # Only rewrite the index when this project's entry actually changed
+        content = json.dumps(index, indent=2)
+        if content == existing_content:
+            return
+
+        temp_file = self.global_index_file.with_suffix(".tmp")
+        with open(temp_file, "w") as f:
+            f.write(content)
+        os.replace(temp_file, self.global_index_file)
+
+    def _list_git_files(self) -> Optional[List[str]]:
+        """
+        List tracked and untracked, non-ignored files using git.
+
+        Returns:
+            Relative POSIX paths, or None if the source is not a git repo or
+            git could not list its files
+        """
+        if not (self.source_path / ".git").exists():
+            return None
+
+        result = subprocess.run(
+            ["git", "-C", str(self.source_path), "ls-files",
+             "-co", "--exclude-standard", "-z"],
+            capture_output=True,
+            env=self._git_env,
+        )
+        if result.returncode != 0:
+            return None
+
+        # Unmerged paths are listed once per stage; keep the first of each
+        return [
+            os.fsdecode(name)
+            for name in dict.fromkeys(result.stdout.split(b"\x00"))
+            if name
+        ]
+
+    def _iter_source_files(self) -> Iterator[Tuple[str, str, os.stat_result]]:
+        """
+        Yield (source_file, rel_path, stat) for every file that should be synced.
+
+        Paths are plain strings, with rel_path in POSIX form, to keep
+        per-file bookkeeping small on large trees. Each file is stat'ed once.
+
+        Uses `git ls-files` when the source is a git repo, letting git
+        handle traversal and ignore rules. Otherwise walks the tree with
+        os.scandir, applying the gitignore patterns in Python and not
+        descending into ignored directories.
+        """
+        git_files = self._list_git_files()
+        if git_files is not None:
+            source_root = str(self.source_path)
+            for rel_path in git_files:
+                source_file = os.path.join(source_root, rel_path)
+                try:
+                    file_stat = os.stat(source_file)
+                except OSError:
+                    # Deleted tracked file
+                    continue
+                # Skip submodule directories
+                if stat.S_ISREG(file_stat.st_mode):
+                    yield source_file, rel_path, file_stat
+            return
+
+        ignore_parser = self.ignore_parser
+        for source_file, rel_path, entry in walk_files(
+            str(self.source_path), ignore_parser.should_ignore_dir
+        ):
+            # Check if should be ignored
+            if ignore_parser.should_ignore(rel_path):
+                continue
+
+            try:
+                yield source_file, rel_path, entry.stat()
+            except OSError:
+                continue
+
+    def _staged_files(self) -> Dict[str, Tuple[str, str]]:
+        """
+        Get the source files currently staged in the ledgit index.
+
+        Returns:
+            Mapping of path relative to files/ -> (mode, blob SHA)
+        """
+        prefix = f"{FILES_PREFIX}/"
+        repo = self.repo
+        if repo is not None:
+            index = repo.index
+            index.read()
+            return {
+                entry.path[len(prefix):]: (f"{entry.mode:o}", str(entry.id))
+                for entry in index
+                if entry.path.startswith(prefix)
+            }
+
+        result = self._run_git(
+            ["ls-files", "-s", "-z", "--", FILES_PREFIX],
+            cwd=self.project_dir
+        )
+        staged = {}
+        for entry in result.stdout.split("\0"):
+            if not entry:
+                continue
+            info, path = entry.split("\t", 1)
+            mode, sha, _stage = info.split(" ")
+            staged[path[len(prefix):]] = (mode, sha)
+        return staged
+
+    def _hash_objects(self, rel_paths: List[str]) -> List[str]:
+        """
+        Write blobs for source files into the ledgit object store.
+
+        Large file lists are split into chunks hashed by concurrent
+        `git hash-object` processes, since a single one reads, hashes and
+        compresses files serially.
+
+        Args:
+            rel_paths: Paths relative to the source project
+
+        Returns:
+            Blob SHAs, in the same order as rel_paths
+        """
+        if not rel_paths:
+            return []
+
+        repo = self.repo
+        if repo is not None:
+            return [
+                str(repo.create_blob_fromdisk(str(self.source_path / rel_path)))
+                for rel_path in rel_paths
+            ]
+
+        workers = min(os.cpu_count() or 1, len(rel_paths) // HASH_CHUNK_MIN_FILES)
+        if workers <= 1:
+            return self._hash_object_chunk(rel_paths)
+
+        chunk_size = -(-len(rel_paths) // workers)
+        chunks = [
+            rel_paths[i:i + chunk_size]
+            for i in range(0, len(rel_paths), chunk_size)
+        ]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self._hash_object_chunk, chunks)
+            return [sha for chunk_shas in results for sha in chunk_shas]
+
+    def _hash_object_chunk(self, rel_paths: List[str]) -> List[str]:
+        """Run a single `git hash-object -w` over a list of source paths."""
+        result = self._run_git(
+            ["--git-dir", str(self.project_dir / ".git"),
+             "hash-object", "-w", "--no-filters", "--stdin-paths"],
+            cwd=self.source_path,
+            input="".join(f"{_quote_stdin_path(rel_path)}\n" for rel_path in rel_paths)
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git hash-object failed: {result.stderr.strip()}")
+        return result.stdout.split()
+
+    def _update_index(self, entries: List[Tuple[str, str, str]]) -> None:
+        """
+        Apply (mode, blob SHA, path) entries to the ledgit index.
 
-    def sync_files(self) -> int:
+        Entries with mode "0" remove the path.
         """
-        Sync files from source project to ledgit files directory.
+        repo = self.repo
+        if repo is not None:
+            index = repo.index
+            for mode, sha, path in entries:
+                if mode == "0":
+                    index.remove(path)
+                else:
+                    index.add(pygit2.IndexEntry(path, pygit2.Oid(hex=sha), int(mode, 8)))
+            index.write()
+            return
+
+        result = self._run_git(
+            ["update-index", "-z", "--index-info"],
+            cwd=self.project_dir,
+            input="".join(f"{mode} {sha}\t{path}\0" for mode, sha, path in entries)
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git update-index failed: {result.stderr.strip()}")
+
+    def _index_matches_head(self) -> bool:
+        """Check whether the ledgit index tree is the same as HEAD's tree."""
+        repo = self.repo
+        if repo is not None:
+            index = repo.index
+            index.read()
+            if repo.head_is_unborn:
+                return len(index) == 0
+            return index.write_tree() == repo.head.peel().tree.id
+
+        result = self._run_git(
+            ["diff-index", "--cached", "--quiet", "HEAD", "--"],
+            cwd=self.project_dir
+        )
+        return result.returncode == 0
+
+    def _head_sha(self) -> Optional[str]:
+        """Get the SHA of the ledgit repo's HEAD commit."""
+        repo = self.repo
+        if repo is not None:
+            return None if repo.head_is_unborn else str(repo.head.target)
 
-        Respects .gitignore patterns from source project.
+        commit_sha = self._read_head_ref()
+        if commit_sha is not None:
+            return commit_sha
+
+        head = self._run_git(["rev-parse", "HEAD"], cwd=self.project_dir)
+        return head.stdout.strip() if head.returncode == 0 else None
+
+    def _read_head_ref(self) -> Optional[str]:
+        """
+        Resolve HEAD by reading ref files directly instead of spawning git.
 
         Returns:
-            Number of files synced
+            Commit SHA, or None if HEAD could not be resolved this way
         """
-        files_synced = 0
+        git_dir = self.project_dir / ".git"
+        try:
+            head = (git_dir / "HEAD").read_text().strip()
+            if not head.startswith("ref: "):
+                # Detached HEAD holds the SHA itself
+                return head or None
+
+            ref = head[len("ref: "):]
+            ref_file = git_dir / ref
+            if ref_file.is_file():
+                return ref_file.read_text().strip() or None
+
+            packed_refs = git_dir / "packed-refs"
+            if packed_refs.is_file():
+                for line in packed_refs.read_text().splitlines():
+                    if line.startswith(("#", "^")):
+                        continue
+                    sha, _, name = line.partition(" ")
+                    if name == ref:
+                        return sha
+        except OSError:
+            pass
+        return None
 
-        # Track which files exist in destination for cleanup
-        existing_files = set()
-        if self.files_dir.exists():
-            for path in self.files_dir.rglob("*"):
-                if path.is_file():
-                    existing_files.add(path.relative_to(self.files_dir))
+    def _commit_index(self, message: str) -> Optional[str]:
+        """
+        Commit the ledgit index on top of HEAD.
 
-        # Walk source directory
-        synced_files = set()
-        for source_file in self.source_path.rglob("*"):
-            if not source_file.is_file():
+        Returns:
+            SHA of the new commit, or None if committing failed
+        """
+        repo = self.repo
+        if repo is not None:
+            try:
+                signature = repo.default_signature
+            except (KeyError, pygit2.GitError):
+                # No identity in git config; let the git CLI resolve one
+                signature = None
+            if signature is not None:
+                parents = [] if repo.head_is_unborn else [repo.head.target]
+                tree = repo.index.write_tree()
+                if parents and tree == repo.head.peel().tree.id:
+                    # Nothing to commit, matching the git CLI
+                    return None
+                commit_id = repo.create_commit(
+                    "HEAD", signature, signature, message, tree, parents
+                )
+                return str(commit_id)
+
+        # With core.abbrev=40 the summary line carries the full SHA, so no
+        # rev-parse is needed; the message goes in on stdin
+        result = self._run_git(
+            ["-c", "core.abbrev=40", "commit", "--no-verify", "-F", "-"],
+            cwd=self.project_dir,
+            input=message
+        )
+        if result.returncode != 0:
+            return None
+        return _parse_commit_sha(result.stdout)
+
+    def _scan_source_files(self) -> List[Tuple[str, str, os.stat_result]]:
+        """
+        Stat every source file that should be snapshotted.
+
+        Returns:
+            List of (source_file, rel_path, stat) with POSIX rel_paths
+        """
+        return list(self._iter_source_files())
+
+    def _source_signature(self, source_files: List[Tuple[str, str, os.stat_result]]) -> List[int]:
+        """
+        Summarize the source tree as [file count, latest ctime_ns].
+
+        ctime is used rather than mtime since editors cannot set it back,
+        and directory ctimes are included so renames and deletions show up.
+        """
+        latest = 0
+        dirs = {str(self.source_path)}
+        for source_file, _, file_stat in source_files:
+            latest = max(latest, file_stat.st_ctime_ns)
+            dirs.add(os.path.dirname(source_file))
+        for dir_path in dirs:
+            try:
+                latest = max(latest, os.stat(dir_path).st_ctime_ns)
+            except OSError:
                 continue
+        return [len(source_files), latest]
 
-            # Get relative path
-            rel_path = source_file.relative_to(self.source_path)
+    def _load_source_signature(self) -> Optional[List[int]]:
+        """Load the source signature recorded at the last snapshot."""
+        try:
+            with open(self.cache_dir / "source_signature.json") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
 
-            # Check if should be ignored
-            if self.ignore_parser.should_ignore(rel_path):
+    def _save_source_signature(self, signature: List[int]) -> None:
+        """Record the source signature of the latest snapshot."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_dir / "source_signature.json", "w") as f:
+                f.write(json.dumps(signature))
+        except OSError:
+            pass
+
+    def _clear_source_signature(self) -> None:
+        """Forget the recorded source signature, forcing the next sync."""
+        try:
+            os.remove(self.cache_dir / "source_signature.json")
+        except OSError:
+            pass
+
+    def sync_files(self, source_files: Optional[List[Tuple[str, str, os.stat_result]]] = None) -> int:
+        """
+        Stage files from the source project into the ledgit index.
+
+        Respects .gitignore patterns from source project. Blobs are written
+        straight from the source tree with `git hash-object`, and staged
+        under files/ with `git update-index`; no copy of the project is
+        kept on disk. Files whose fingerprint matches the cached one for
+        their staged blob are not re-hashed.
+
+        Args:
+            source_files: Result of _scan_source_files, if already scanned
+
+        Returns:
+            Number of files added, modified or removed
+        """
+        if source_files is None:
+            source_files = self._scan_source_files()
+
+        staged = self._staged_files()
+        fingerprints = self._load_fingerprints()
+        new_fingerprints = {}
+
+        # Find files whose content may differ from what is staged
+        to_hash = []
+        for source_file, rel_path, file_stat in source_files:
+            mode = "100755" if file_stat.st_mode & stat.S_IXUSR else "100644"
+            fingerprint = _file_fingerprint(source_file, file_stat)
+            current = staged.pop(rel_path, None)
+
+            if (current is not None and current[0] == mode and fingerprint is not None
+                    and fingerprints.get(rel_path) == (fingerprint, current[1])):
+                new_fingerprints[rel_path] = (fingerprint, current[1])
                 continue
+            to_hash.append((source_file, rel_path, file_stat, mode, fingerprint, current))
 
-            # Determine destination
-            dest_file = self.files_dir / rel_path
-            synced_files.add(rel_path)
-
-            # Check if file needs updating
-            needs_copy = True
-            if dest_file.exists():
-                # Compare modification times and sizes
-                src_stat = source_file.stat()
-                dst_stat = dest_file.stat()
-                if (src_stat.st_mtime <= dst_stat.st_mtime and
-                    src_stat.st_size == dst_stat.st_size):
-                    needs_copy = False
-
-            if needs_copy:
-                # Ensure parent directory exists
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
-                # Copy file preserving metadata
-                shutil.copy2(source_file, dest_file)
-                files_synced += 1
+        # Write blobs for new or changed files into the ledgit object store
+        shas = self._hash_objects([rel_path for _, rel_path, _, _, _, _ in to_hash])
+
+        # Stage only entries that differ from the index
+        entries = []
+        for (source_file, rel_path, file_stat, mode, fingerprint, current), sha in zip(to_hash, shas):
+            # The fingerprint and the blob come from separate reads; only
+            # pair them up if the file was not modified in between
+            if fingerprint is not None and _stat_unchanged(source_file, file_stat):
+                new_fingerprints[rel_path] = (fingerprint, sha)
+            if current != (mode, sha):
+                entries.append((mode, sha, f"{FILES_PREFIX}/{rel_path}"))
 
         # Remove files that no longer exist in source
-        for old_file in existing_files - synced_files:
-            old_path = self.files_dir / old_file
-            if old_path.exists():
-                old_path.unlink()
-                # Try to remove empty parent directories
-                try:
-                    old_path.parent.rmdir()
-                except OSError:
-                    pass
+        for rel_path in staged:
+            entries.append(("0", NULL_SHA, f"{FILES_PREFIX}/{rel_path}"))
 
-        return files_synced
+        if entries:
+            self._update_index(entries)
 
-    def _run_git(self, args: List[str], cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+        if new_fingerprints != fingerprints:
+            self._save_fingerprints(new_fingerprints)
+
+        return len(entries)
+
+    def _load_fingerprints(self) -> Dict[str, Tuple[tuple, str]]:
+        """Load the rel_path -> (fingerprint, blob SHA) cache."""
+        try:
+            with open(self.cache_dir / "fingerprints.pkl", "rb") as f:
+                fingerprints = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return {}
+        return fingerprints if isinstance(fingerprints, dict) else {}
+
+    def _save_fingerprints(self, fingerprints: Dict[str, Tuple[tuple, str]]) -> None:
+        """Save the rel_path -> (fingerprint, blob SHA) cache."""
+        cache_file = self.cache_dir / "fingerprints.pkl"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_suffix(".tmp")
+            with open(temp_file, "wb") as f:
+                pickle.dump(fingerprints, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except (OSError, pickle.PickleError):
+            pass
+
+    def _stage_project_data(self) -> None:
+        """Stage everything in the ledgit repo except the files/ snapshot and caches."""
+        self._run_git(
+            ["add", "-A", "--", ".",
+             f":(exclude){FILES_PREFIX}", f":(exclude){CACHE_DIR_NAME}"],
+            cwd=self.project_dir
+        )
+
+    def _run_git(
+        self,
+        args: List[str],
+        cwd: Optional[Path] = None,
+        input: Optional[str] = None
+    ) -> subprocess.CompletedProcess:
         """Run a git command."""
         cwd = cwd or self.project_dir
         result = subprocess.run(
             ["git"] + args,
             cwd=cwd,
+            input=input,
             capture_output=True,
-            text=True
+            text=True,
+            env=self._git_env
         )
         return result
 
@@ -451,32 +1122,30 @@ class LedgitManager:
         if not self.project_exists():
             self.initialize_project()
 
-        # Sync files from source
-        files_synced = self.sync_files()
-
-        # Stage all changes
-        self._run_git(["add", "."], cwd=self.project_dir)
-
-        # Check if there are changes to commit
-        status = self._run_git(["status", "--porcelain"], cwd=self.project_dir)
-        if not status.stdout.strip():
-            # No changes, but we might still want to record the current commit
-            head = self._run_git(["rev-parse", "HEAD"], cwd=self.project_dir)
-            if head.returncode == 0:
-                commit_sha = head.stdout.strip()
-                timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-                return CommitRecord(
-                    step_id=step_id,
-                    event=event,
-                    commit_sha=commit_sha,
-                    timestamp=timestamp,
-                    message="No changes (referencing existing commit)",
-                    files_changed=0,
-                )
-            return None
+        # Projects created before snapshots were staged straight into the
+        # index still have a files/ mirror checked out; it is never updated
+        # again, so remove it on their first snapshot
+        if not self.cache_dir.exists():
+            shutil.rmtree(self.project_dir / FILES_PREFIX, ignore_errors=True)
+
+        # Skip staging entirely if nothing in the source changed since the
+        # last snapshot. Otherwise compare the index with HEAD rather than
+        # relying on the staged count, so entries staged by a snapshot whose
+        # commit failed still get committed
+        source_files = self._scan_source_files()
+        signature = self._source_signature(source_files)
+        previous_signature = self._load_source_signature()
+        if signature == previous_signature:
+            changed_files = 0
+            index_changed = False
+        else:
+            changed_files = self.sync_files(source_files)
+            # Even with nothing newly staged, the index can differ from
+            # HEAD if an earlier snapshot's commit failed
+            index_changed = changed_files > 0 or not self._index_matches_head()
 
-        # Count changed files
-        changed_files = len([l for l in status.stdout.strip().split("\n") if l])
+        if not index_changed:
+            return self._reference_head(step_id, event, signature, previous_signature)
 
         # Create commit message
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -485,14 +1154,16 @@ class LedgitManager:
 
         commit_msg = f"[ledgit] {message}\n\nSession: {session_id}\nStep: {step_id}\nEvent: {event}\nTimestamp: {timestamp}"
 
-        # Commit
-        result = self._run_git(["commit", "-m", commit_msg], cwd=self.project_dir)
-        if result.returncode != 0:
+        commit_sha = self._commit_index(commit_msg)
+        if commit_sha is None:
+            if self._index_matches_head():
+                # The staged entries put the index back to HEAD's tree
+                return self._reference_head(step_id, event, signature, previous_signature)
+            # Forget the signature so the next snapshot re-syncs and
+            # retries the commit, even if the source looks unchanged
+            self._clear_source_signature()
             return None
-
-        # Get commit SHA
-        head = self._run_git(["rev-parse", "HEAD"], cwd=self.project_dir)
-        commit_sha = head.stdout.strip()
+        self._save_source_signature(signature)
 
         return CommitRecord(
             step_id=step_id,
@@ -503,46 +1174,89 @@ class LedgitManager:
             files_changed=changed_files,
         )
 
+    def _reference_head(
+        self,
+        step_id: int,
+        event: str,
+        signature: List[int],
+        previous_signature: Optional[List[int]]
+    ) -> Optional[CommitRecord]:
+        """
+        Record a snapshot that references the existing HEAD commit.
+
+        Only called once the index is known to match HEAD, so the source
+        signature is never recorded over uncommitted entries.
+        """
+        commit_sha = self._head_sha()
+        if commit_sha is None:
+            return None
+
+        if signature != previous_signature:
+            self._save_source_signature(signature)
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return CommitRecord(
+            step_id=step_id,
+            event=event,
+            commit_sha=commit_sha,
+            timestamp=timestamp,
+            message="No changes (referencing existing commit)",
+            files_changed=0,
+        )
+
+    def commit_project_data(self, message: str) -> bool:
+        """
+        Commit session data (trajectories, config) to the ledgit repo.
+
+        Args:
+            message: Commit message
+
+        Returns:
+            True if a commit was created
+        """
+        self._stage_project_data()
+        result = self._run_git(["commit", "-m", message], cwd=self.project_dir)
+        return result.returncode == 0
+
     def get_session_dir(self, session_folder_name: str) -> Path:
         """Get the directory for a session's trajectories."""
         return self.trajectories_dir / session_folder_name
 
     def save_commit_record(self, session_folder: str, record: CommitRecord) -> None:
-        """Save a commit record to the session's commits.json."""
+        """Append a commit record to the session's commits.jsonl."""
         session_dir = self.get_session_dir(session_folder)
         session_dir.mkdir(parents=True, exist_ok=True)
 
-        commits_file = session_dir / "commits.json"
-
-        # Load existing commits
-        commits = {"snapshots": []}
-        if commits_file.exists():
-            try:
-                with open(commits_file) as f:
-                    commits = json.load(f)
-            except json.JSONDecodeError:
-                pass
-
-        # Add new record
-        commits["snapshots"].append(record.to_dict())
-
-        # Save
-        with open(commits_file, "w") as f:
-            json.dump(commits, f, indent=2)
+        with open(session_dir / "commits.jsonl", "a") as f:
+            f.write(json.dumps(record.to_dict()) + "\n")
 
     def load_commit_records(self, session_folder: str) -> List[CommitRecord]:
         """Load all commit records for a session."""
-        commits_file = self.get_session_dir(session_folder) / "commits.json"
+        session_dir = self.get_session_dir(session_folder)
+        records = []
 
-        if not commits_file.exists():
-            return []
+        # Sessions recorded before commits.jsonl kept a single commits.json
+        legacy_file = session_dir / "commits.json"
+        if legacy_file.exists():
+            try:
+                with open(legacy_file) as f:
+                    data = json.load(f)
+                    records.extend(CommitRecord.from_dict(r) for r in data.get("snapshots", []))
+            except (json.JSONDecodeError, KeyError):
+                pass
 
-        try:
+        commits_file = session_dir / "commits.jsonl"
+        if commits_file.exists():
             with open(commits_file) as f:
-                data = json.load(f)
-                return [CommitRecord.from_dict(r) for r in data.get("snapshots", [])]
-        except (json.JSONDecodeError, KeyError):
-            return []
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append(CommitRecord.from_dict(json.loads(line)))
+                    except (json.JSONDecodeError, KeyError):
+                        # Skip malformed lines (e.g. a partially written record)
+                        continue
+
+        return records
 
     def set_remote(self, remote_url: str, remote_name: str = "origin") -> bool:
         """Set the git remote for this project."""
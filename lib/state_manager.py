@@ -16,7 +16,7 @@ Directory structure:
 │       ├── trajectory.jsonl
 │       ├── metadata.json
 │       ├── state.json
-│       └── commits.json
+│       └── commits.jsonl
 ├── ledgit.json
 └── index.json
 
@@ -116,6 +116,11 @@ class SessionState:
     # Track processed transcript lines to avoid duplicates
     last_transcript_line: int = 0
 
+    # Byte offset read up to in the transcript, and the number of
+    # messages before it, so the transcript can be parsed incrementally
+    transcript_byte_offset: int = 0
+    transcript_offset_messages: int = 0
+
     # Extra metadata
     extra: dict[str, Any] = field(default_factory=dict)
 
@@ -136,6 +141,8 @@ class SessionState:
             "pending_tool_calls": self.pending_tool_calls,
             "last_assistant_turn_id": self.last_assistant_turn_id,
             "last_transcript_line": self.last_transcript_line,
+            "transcript_byte_offset": self.transcript_byte_offset,
+            "transcript_offset_messages": self.transcript_offset_messages,
             "extra": self.extra,
         }
 
@@ -157,6 +164,8 @@ class SessionState:
             pending_tool_calls=data.get("pending_tool_calls", {}),
             last_assistant_turn_id=data.get("last_assistant_turn_id"),
             last_transcript_line=data.get("last_transcript_line", 0),
+            transcript_byte_offset=data.get("transcript_byte_offset", 0),
+            transcript_offset_messages=data.get("transcript_offset_messages", 0),
             extra=data.get("extra", {}),
         )
 
@@ -330,7 +339,7 @@ class StateManager:
             with open(temp_file, "w") as f:
                 fcntl.flock(f.fileno(), fcntl.LOCK_EX)
                 try:
-                    json.dump(index, f, indent=2)
+                    f.write(json.dumps(index, indent=2))
                 finally:
                     fcntl.flock(f.fileno(), fcntl.LOCK_UN)
             temp_file.rename(self.index_file)
@@ -372,7 +381,7 @@ class StateManager:
         """Save session metadata to metadata.json."""
         self.ensure_session_dir()
         with open(self.metadata_file, "w") as f:
-            json.dump(metadata.to_dict(), f, indent=2)
+            f.write(json.dumps(metadata.to_dict(), indent=2))
 
     def load_metadata(self) -> Optional[SessionMetadata]:
         """Load session metadata from metadata.json."""
@@ -431,7 +440,7 @@ class StateManager:
             with open(temp_file, "w") as f:
                 fcntl.flock(f.fileno(), fcntl.LOCK_EX)
                 try:
-                    json.dump(self._state.to_dict(), f, indent=2)
+                    f.write(json.dumps(self._state.to_dict(), indent=2))
                 finally:
                     fcntl.flock(f.fileno(), fcntl.LOCK_UN)
             temp_file.rename(self.state_file)
@@ -624,6 +633,20 @@ class StateManager:
         state = self.load_state()
         return state.last_transcript_line
 
+    def update_transcript_progress(self, line_number: int, byte_offset: int,
+                                   message_count: int) -> None:
+        """Track the processed transcript line and read offset in one save."""
+        state = self.load_state()
+        state.last_transcript_line = line_number
+        state.transcript_byte_offset = byte_offset
+        state.transcript_offset_messages = message_count
+        self.save_state(state)
+
+    def get_transcript_offset(self) -> tuple[int, int]:
+        """Get the transcript byte offset and the message count before it."""
+        state = self.load_state()
+        return state.transcript_byte_offset, state.transcript_offset_messages
+
     def set_extra(self, key: str, value: Any) -> None:
         """Set an extra metadata value."""
         state = self.load_state()
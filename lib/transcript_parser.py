@@ -134,6 +134,52 @@ class TranscriptParser:
         self._parsed = True
         return self._messages
 
+    def parse_from(self, offset: int = 0) -> tuple[list[ParsedMessage], int]:
+        """
+        Parse only the part of the transcript after a byte offset.
+
+        Lets callers that run repeatedly on a growing transcript read just
+        the new bytes. A trailing line is only consumed once it is complete.
+
+        Args:
+            offset: Byte offset to start reading from (start of a line)
+
+        Returns:
+            Tuple of (messages, new_offset). If the file is shorter than
+            offset (e.g. it was truncated), parsing restarts from 0; callers
+            can detect this by new_offset < offset.
+        """
+        if not self.transcript_path.exists():
+            return [], 0
+
+        with open(self.transcript_path, "rb") as f:
+            f.seek(0, 2)
+            if f.tell() < offset:
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+
+        messages = []
+        consumed = 0
+        for line in data.splitlines(keepends=True):
+            stripped = line.strip()
+            if stripped:
+                try:
+                    raw = json.loads(stripped)
+                except json.JSONDecodeError:
+                    if not line.endswith(b"\n"):
+                        # Partially written last line; pick it up next time
+                        break
+                    # Skip malformed lines
+                    consumed += len(line)
+                    continue
+                message = self._parse_message(raw)
+                if message:
+                    messages.append(message)
+            consumed += len(line)
+
+        return messages, offset + consumed
+
     def _parse_message(self, data: dict) -> Optional[ParsedMessage]:
         """
         Parse a single message from the transcript.